@@ -0,0 +1,36 @@
+import os
+
+from custom_tools.aws_session import get_session
+
+
+class MissingAWSCredentialsError(Exception):
+    """Custom exception raised when AWS credentials are missing."""
+    pass
+
+
+# Set once the environment has been checked successfully, so later tools skip the lookup
+_credentials_checked = False
+
+
+def ensure_credentials() -> None:
+    """
+    Checks that AWS credentials are present in the environment and boots the shared Session.
+    The check runs only until it first succeeds.
+
+    Raises:
+        MissingAWSCredentialsError: If AWS access keys and secret keys are not found in the environment.
+    """
+    global _credentials_checked
+    if _credentials_checked:
+        return
+
+    aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
+    aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
+    if not aws_access_key or not aws_secret_key:
+        raise MissingAWSCredentialsError(
+            "AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY must be set as environment variables. "
+            "Please set these variables and try again."
+        )
+
+    get_session()
+    _credentials_checked = True
@@ -1,14 +1,30 @@
-import os
 from phi.tools import Toolkit
 
-try:
-    import boto3
-except ImportError:
-    raise ImportError("boto3 is required for EC2Tool. Please install it using `pip install boto3`.")
+from custom_tools._credentials import MissingAWSCredentialsError, ensure_credentials  # noqa: F401 (re-exported)
+from custom_tools.aws_session import describe_client_error, get_client
+from custom_tools.ttl_cache import TTLCache
+from botocore.exceptions import BotoCoreError, ClientError
+
+# Seconds a list_instances result is reused before DescribeInstances is called again
+INSTANCES_CACHE_TTL = 30
+
+# Cache of formatted list_instances results, keyed on region
+_instances_cache = TTLCache(ttl=INSTANCES_CACHE_TTL)
+
+# Instance IDs EC2 recently rejected as malformed, keyed on (region, instance ID). NotFound is
+# not cached because freshly launched instances can briefly read as not found.
+_missing_instances = TTLCache(ttl=60)
+
+
+def invalidate_cache(region_name: str = None) -> None:
+    """
+    Drops cached list_instances results.
+
+    Args:
+        region_name (str, optional): The region to invalidate. If omitted, all regions are cleared.
+    """
+    _instances_cache.invalidate(region_name)
 
-class MissingAWSCredentialsError(Exception):
-    """Custom exception raised when AWS credentials are missing."""
-    pass
 
 class EC2Tool(Toolkit):
     """
@@ -40,6 +56,16 @@ class EC2Tool(Toolkit):
     name: str = "EC2Tool"
     description: str = "A tool for managing AWS EC2 instances"
 
+    # Methods exposed to the agent, registered in this order
+    _TOOLS = (
+        "list_instances",
+        "start_instance",
+        "stop_instance",
+        "check_instance_status",
+        "terminate_instance",
+        "create_instance",
+    )
+
     def __init__(self, region_name: str = "us-east-1"):
         """
         Initialize the EC2Tool with a specific AWS region.
@@ -49,42 +75,55 @@ class EC2Tool(Toolkit):
         """
         super().__init__()
         
-        # Check if AWS credentials are present in the environment
-        aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
-        aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-        if not aws_access_key or not aws_secret_key:
-            raise MissingAWSCredentialsError(
-                "AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY must be set as environment variables. "
-                "Please set these variables and try again."
-            )
+        ensure_credentials()
         
-        self.client = boto3.client("ec2", region_name=region_name)
-        self.register(self.list_instances)
-        self.register(self.start_instance)
-        self.register(self.stop_instance)
-        self.register(self.check_instance_status)
-        self.register(self.terminate_instance)
-        self.register(self.create_instance)
+        self.region_name = region_name
+
+        for tool in self._TOOLS:
+            self.register(getattr(self, tool))
 
 
+    @property
+    def client(self):
+        """
+        The shared EC2 client for this tool's region.
+        """
+        return get_client("ec2", self.region_name)
+
     def list_instances(self) -> str:
         """
         Lists all EC2 instances in the specified region, along with their current state.
+        Results are cached per region for INSTANCES_CACHE_TTL seconds.
 
         Returns:
             str: A formatted list of instance IDs and their states.
         """
+        cached = _instances_cache.get(self.region_name)
+        if cached is not None:
+            return cached
+
         try:
-            response = self.client.describe_instances()
-            instances = []
-            for reservation in response["Reservations"]:
-                for instance in reservation["Instances"]:
-                    instances.append(
-                        f"Instance ID: {instance['InstanceId']}, State: {instance['State']['Name']}"
-                    )
-            return "\n".join(instances) if instances else "No EC2 instances found."
-        except Exception as e:
-            return f"Error listing instances: {str(e)}"
+            paginator = self.client.get_paginator("describe_instances")
+            instances = (
+                f"Instance ID: {instance['InstanceId']}, State: {instance['State']['Name']}"
+                for page in paginator.paginate(PaginationConfig={"PageSize": 1000})
+                for reservation in page["Reservations"]
+                for instance in reservation["Instances"]
+            )
+            result = "\n".join(instances) or "No EC2 instances found."
+        except ClientError as e:
+            return f"Error listing instances: {describe_client_error(e)}"
+        except BotoCoreError as e:
+            return f"Error listing instances: {e}"
+
+        _instances_cache.set(self.region_name, result)
+        return result
+
+    def invalidate_cache(self) -> None:
+        """
+        Drops the cached list_instances result for this tool's region.
+        """
+        invalidate_cache(self.region_name)
 
     def start_instance(self, instance_id: str) -> str:
         """
@@ -98,9 +137,12 @@ class EC2Tool(Toolkit):
         """
         try:
             self.client.start_instances(InstanceIds=[instance_id])
+            self.invalidate_cache()
             return f"Instance {instance_id} is starting."
-        except Exception as e:
-            return f"Error starting instance {instance_id}: {str(e)}"
+        except ClientError as e:
+            return f"Error starting instance {instance_id}: {describe_client_error(e)}"
+        except BotoCoreError as e:
+            return f"Error starting instance {instance_id}: {e}"
 
     def stop_instance(self, instance_id: str) -> str:
         """
@@ -114,9 +156,12 @@ class EC2Tool(Toolkit):
         """
         try:
             self.client.stop_instances(InstanceIds=[instance_id])
+            self.invalidate_cache()
             return f"Instance {instance_id} is stopping."
-        except Exception as e:
-            return f"Error stopping instance {instance_id}: {str(e)}"
+        except ClientError as e:
+            return f"Error stopping instance {instance_id}: {describe_client_error(e)}"
+        except BotoCoreError as e:
+            return f"Error stopping instance {instance_id}: {e}"
 
     def check_instance_status(self, instance_id: str) -> str:
         """
@@ -128,14 +173,23 @@ class EC2Tool(Toolkit):
         Returns:
             str: The current status of the instance.
         """
+        missing = _missing_instances.get((self.region_name, instance_id))
+        if missing is not None:
+            return f"Error checking status of instance {instance_id}: {missing}"
+
         try:
             response = self.client.describe_instance_status(InstanceIds=[instance_id])
             if not response["InstanceStatuses"]:
                 return f"Instance {instance_id} is stopped or does not exist."
             state = response["InstanceStatuses"][0]["InstanceState"]["Name"]
             return f"Instance {instance_id} is {state}."
-        except Exception as e:
-            return f"Error checking status of instance {instance_id}: {str(e)}"
+        except ClientError as e:
+            error = describe_client_error(e)
+            if e.response["Error"]["Code"] == "InvalidInstanceID.Malformed":
+                _missing_instances.set((self.region_name, instance_id), error)
+            return f"Error checking status of instance {instance_id}: {error}"
+        except BotoCoreError as e:
+            return f"Error checking status of instance {instance_id}: {e}"
         
     def create_instance(self, image_id: str, instance_type: str, key_name: str = None, security_group: str = None, min_count: int = 1, max_count: int = 1) -> str:
         """
@@ -159,21 +213,21 @@ class EC2Tool(Toolkit):
                 "InstanceType": instance_type,
                 "MinCount": min_count,
                 "MaxCount": max_count,
+                **({"KeyName": key_name} if key_name else {}),
+                **({"SecurityGroups": [security_group]} if security_group else {}),
             }
 
-            if key_name:
-                launch_params["KeyName"] = key_name
-            if security_group:
-                launch_params["SecurityGroups"] = [security_group]
-
             # Create the instance(s)
             response = self.client.run_instances(**launch_params)
+            self.invalidate_cache()
 
             # Collect the instance IDs of the launched instances
             instance_ids = [instance["InstanceId"] for instance in response["Instances"]]
             return f"Instance(s) created successfully. Instance ID(s): {', '.join(instance_ids)}"
-        except Exception as e:
-            return f"Error creating instance: {str(e)}"
+        except ClientError as e:
+            return f"Error creating instance: {describe_client_error(e)}"
+        except BotoCoreError as e:
+            return f"Error creating instance: {e}"
 
 
     def terminate_instance(self, instance_id: str) -> str:
@@ -188,6 +242,9 @@ class EC2Tool(Toolkit):
         """
         try:
             self.client.terminate_instances(InstanceIds=[instance_id])
+            self.invalidate_cache()
             return f"Instance {instance_id} is terminating."
-        except Exception as e:
-            return f"Error terminating instance {instance_id}: {str(e)}"
+        except ClientError as e:
+            return f"Error terminating instance {instance_id}: {describe_client_error(e)}"
+        except BotoCoreError as e:
+            return f"Error terminating instance {instance_id}: {e}"
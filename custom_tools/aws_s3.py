@@ -1,15 +1,27 @@
-import os
 from phi.tools import Toolkit
 
-try:
-    import boto3
-except ImportError:
-    raise ImportError("boto3 is required for S3Tool. Please install it using `pip install boto3`.")
+from custom_tools._credentials import MissingAWSCredentialsError, ensure_credentials  # noqa: F401 (re-exported)
+from custom_tools.aws_session import describe_client_error, get_client
+from custom_tools.ttl_cache import TTLCache
+from botocore.exceptions import BotoCoreError, ClientError
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 
 
-class MissingAWSCredentialsError(Exception):
-    """Custom exception raised when AWS credentials are missing."""
-    pass
+# Multipart settings for upload_file: 16MB parts sent by 10 threads once a file exceeds 8MB.
+# max_concurrency stays below the client's max_pool_connections so threads don't wait on the pool.
+_TRANSFER_CFG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=10,
+    use_threads=True,
+)
+
+# Bucket listings change rarely compared to how often the agent asks for them
+_buckets_cache = TTLCache(ttl=60)
+
+# Buckets recently reported as NoSuchBucket, so repeated queries for them don't hit S3 again
+_missing_buckets = TTLCache(ttl=60)
 
 
 class S3Tool(Toolkit):
@@ -34,6 +46,9 @@ class S3Tool(Toolkit):
     name: str = "S3Tool"
     description: str = "A tool for interacting with AWS S3 buckets"
 
+    # Methods exposed to the agent, registered in this order
+    _TOOLS = ("list_buckets", "list_objects", "upload_file", "delete_file")
+
     def __init__(self, region_name: str = "us-east-1"):
         """
         Initialize the S3Tool with a specific AWS region.
@@ -46,27 +61,25 @@ class S3Tool(Toolkit):
         """
         super().__init__()
 
-        # Check if AWS credentials are present in the environment
-        aws_access_key = os.getenv("AWS_ACCESS_KEY_ID")
-        aws_secret_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-        if not aws_access_key or not aws_secret_key:
-            raise MissingAWSCredentialsError(
-                "AWS_ACCESS_KEY_ID and AWS_SECRET_ACCESS_KEY must be set as environment variables. "
-                "Please set these variables and try again."
-            )
+        ensure_credentials()
 
-        # Initialize the S3 client
-        self.client = boto3.client("s3", region_name=region_name)
+        # The S3 client is shared process-wide; see the client property
+        self.region_name = region_name
 
         # Registering the tool's methods
-        self.register(self.list_buckets)
-        self.register(self.list_objects)
-        self.register(self.upload_file)
-        self.register(self.delete_file)
+        for tool in self._TOOLS:
+            self.register(getattr(self, tool))
+
+    @property
+    def client(self):
+        """
+        The shared S3 client for this tool's region.
+        """
+        return get_client("s3", self.region_name)
 
     def list_buckets(self) -> str:
         """
-        Lists all S3 buckets in the AWS account.
+        Lists all S3 buckets in the AWS account. Results are cached for 60 seconds.
 
         Returns:
             str: A comma-separated list of bucket names or an error message if the operation fails.
@@ -74,19 +87,35 @@ class S3Tool(Toolkit):
         Example:
             "Available S3 buckets: bucket1, bucket2, bucket3"
         """
-        try:
-            response = self.client.list_buckets()
-            buckets = [bucket["Name"] for bucket in response.get("Buckets", [])]
-            return f"Available S3 buckets: {', '.join(buckets)}"
-        except Exception as e:
-            return f"Error listing buckets: {str(e)}"
+        cached = _buckets_cache.get("buckets")
+        if cached is not None:
+            return cached
 
-    def list_objects(self, bucket_name: str) -> str:
+        try:
+            # Project bucket names with JMESPath instead of walking each bucket dict. ListBuckets
+            # is only pageable on botocore releases from late 2024 onwards.
+            if self.client.can_paginate("list_buckets"):
+                buckets = self.client.get_paginator("list_buckets").paginate().search("Buckets[].Name")
+            else:
+                buckets = (bucket["Name"] for bucket in self.client.list_buckets().get("Buckets", []))
+            # search() yields None for a page without a Buckets key
+            result = f"Available S3 buckets: {', '.join(name for name in buckets if name is not None)}"
+        except ClientError as e:
+            return f"Error listing buckets: {describe_client_error(e)}"
+        except BotoCoreError as e:
+            return f"Error listing buckets: {e}"
+
+        _buckets_cache.set("buckets", result)
+        return result
+
+    def list_objects(self, bucket_name: str, max_items: int = None) -> str:
         """
-        Lists all objects in a specific S3 bucket.
+        Lists all objects in a specific S3 bucket, following pagination past the first 1000 keys.
 
         Args:
             bucket_name (str): The name of the bucket to list objects from.
+            max_items (int, optional): The maximum number of object keys to return.
+                Useful when only a preview of a large bucket is needed. Default is all objects.
 
         Returns:
             str: A comma-separated list of object keys or an error message if the operation fails.
@@ -97,12 +126,28 @@ class S3Tool(Toolkit):
         Error:
             If the bucket does not exist or is inaccessible, an error message is returned.
         """
+        missing = _missing_buckets.get(bucket_name)
+        if missing is not None:
+            return f"Error listing objects in bucket '{bucket_name}': {missing}"
+
         try:
-            response = self.client.list_objects_v2(Bucket=bucket_name)
-            objects = [obj["Key"] for obj in response.get("Contents", [])]
+            paginator = self.client.get_paginator("list_objects_v2")
+            pagination_config = {"PageSize": 1000}
+            if max_items:
+                pagination_config["MaxItems"] = max_items
+            objects = (
+                obj["Key"]
+                for page in paginator.paginate(Bucket=bucket_name, PaginationConfig=pagination_config)
+                for obj in page.get("Contents", [])
+            )
             return f"Objects in bucket '{bucket_name}': {', '.join(objects)}"
-        except Exception as e:
-            return f"Error listing objects in bucket '{bucket_name}': {str(e)}"
+        except ClientError as e:
+            error = describe_client_error(e)
+            if e.response["Error"]["Code"] == "NoSuchBucket":
+                _missing_buckets.set(bucket_name, error)
+            return f"Error listing objects in bucket '{bucket_name}': {error}"
+        except BotoCoreError as e:
+            return f"Error listing objects in bucket '{bucket_name}': {e}"
 
     def upload_file(self, file_path: str, bucket_name: str, object_name: str) -> str:
         """
@@ -123,10 +168,12 @@ class S3Tool(Toolkit):
             If the file does not exist or the upload fails, an error message is returned.
         """
         try:
-            self.client.upload_file(file_path, bucket_name, object_name)
+            self.client.upload_file(file_path, bucket_name, object_name, Config=_TRANSFER_CFG)
             return f"File '{file_path}' successfully uploaded to bucket '{bucket_name}' as '{object_name}'"
-        except Exception as e:
-            return f"Error uploading file: {str(e)}"
+        except ClientError as e:
+            return f"Error uploading file: {describe_client_error(e)}"
+        except (BotoCoreError, S3UploadFailedError, OSError) as e:
+            return f"Error uploading file: {e}"
 
     def delete_file(self, bucket_name: str, object_name: str) -> str:
         """
@@ -145,11 +192,20 @@ class S3Tool(Toolkit):
         Error:
             If the object does not exist or the deletion fails, an error message is returned.
         """
+        missing = _missing_buckets.get(bucket_name)
+        if missing is not None:
+            return f"Error deleting file: {missing}"
+
         try:
             self.client.delete_object(Bucket=bucket_name, Key=object_name)
             return f"File '{object_name}' successfully deleted from bucket '{bucket_name}'"
-        except Exception as e:
-            return f"Error deleting file: {str(e)}"
+        except ClientError as e:
+            error = describe_client_error(e)
+            if e.response["Error"]["Code"] == "NoSuchBucket":
+                _missing_buckets.set(bucket_name, error)
+            return f"Error deleting file: {error}"
+        except BotoCoreError as e:
+            return f"Error deleting file: {e}"
     
     def create_bucket(self, bucket_name: str, region_name: str = None) -> str:
         """
@@ -177,9 +233,13 @@ class S3Tool(Toolkit):
                     "LocationConstraint": region_name
                 }
             self.client.create_bucket(**create_bucket_params)
+            _buckets_cache.invalidate()
+            _missing_buckets.invalidate(bucket_name)
             return f"Bucket '{bucket_name}' successfully created in region '{region_name or 'us-east-1'}'"
-        except Exception as e:
-            return f"Error creating bucket '{bucket_name}': {str(e)}"
+        except ClientError as e:
+            return f"Error creating bucket '{bucket_name}': {describe_client_error(e)}"
+        except BotoCoreError as e:
+            return f"Error creating bucket '{bucket_name}': {e}"
 
     def delete_bucket(self, bucket_name: str) -> str:
         """
@@ -199,8 +259,11 @@ class S3Tool(Toolkit):
         """
         try:
             self.client.delete_bucket(Bucket=bucket_name)
+            _buckets_cache.invalidate()
             return f"Bucket '{bucket_name}' successfully deleted"
-        except Exception as e:
-            return f"Error deleting bucket '{bucket_name}': {str(e)}"
+        except ClientError as e:
+            return f"Error deleting bucket '{bucket_name}': {describe_client_error(e)}"
+        except BotoCoreError as e:
+            return f"Error deleting bucket '{bucket_name}': {e}"
 
     
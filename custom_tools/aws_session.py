@@ -0,0 +1,95 @@
+import functools
+import socket
+import threading
+
+try:
+    import boto3
+    from botocore.config import Config
+    from botocore.exceptions import ClientError
+except ImportError:
+    raise ImportError("boto3 is required for the AWS tools. Please install it using `pip install boto3`.")
+
+# Client configuration shared by all tools: a larger connection pool and TCP keep-alive
+# so back-to-back calls reuse warm sockets instead of paying a new TLS handshake.
+CLIENT_CONFIG = Config(
+    max_pool_connections=50,
+    tcp_keepalive=True,
+    retries={"mode": "adaptive", "max_attempts": 5},
+    connect_timeout=5,
+    read_timeout=30,
+)
+
+# Endpoints resolved in the background at import so the first AWS call does not wait on DNS.
+# S3 in us-east-1 may be addressed through either the global or the regional hostname.
+PREWARM_ENDPOINTS = ("ec2.us-east-1.amazonaws.com", "s3.amazonaws.com", "s3.us-east-1.amazonaws.com")
+
+# A single boto3 Session shared by every AWS tool in the process. Sessions are not
+# thread-safe, so creating it and creating clients from it happens under the lock.
+_SESSION = None
+_SESSION_LOCK = threading.RLock()
+
+
+def get_session() -> "boto3.session.Session":
+    """
+    Returns the process-wide boto3 Session, creating it on first use.
+
+    Returns:
+        boto3.session.Session: The shared session.
+    """
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = boto3.session.Session()
+    return _SESSION
+
+
+@functools.lru_cache(maxsize=32)
+def get_client(service: str, region: str):
+    """
+    Returns the process-wide boto3 client for a service and region, creating it from the
+    shared Session on first use. Clients are thread-safe and reused by every tool.
+
+    Args:
+        service (str): The AWS service name (e.g., 's3', 'ec2').
+        region (str): The AWS region the client talks to.
+
+    Returns:
+        botocore.client.BaseClient: A client for the requested service and region.
+    """
+    with _SESSION_LOCK:
+        return get_session().client(service, region_name=region, config=CLIENT_CONFIG)
+
+
+def describe_client_error(error: "ClientError") -> str:
+    """
+    Formats a ClientError from the error code and message AWS returned, without
+    rendering the rest of the response envelope.
+
+    Args:
+        error (ClientError): The error raised by a boto3 client call.
+
+    Returns:
+        str: The error formatted as '<Code>: <Message>'.
+    """
+    details = error.response.get("Error", {})
+    return f"{details.get('Code', 'Unknown')}: {details.get('Message', '')}"
+
+
+def prime_dns(hosts=PREWARM_ENDPOINTS, port: int = 443) -> None:
+    """
+    Resolves AWS endpoint hostnames so the answers are already in the resolver cache
+    by the time the first client connects. Lookup failures are ignored.
+
+    Args:
+        hosts (Iterable[str]): The hostnames to resolve. Default is PREWARM_ENDPOINTS.
+        port (int): The port passed to getaddrinfo. Default is 443.
+    """
+    for host in hosts:
+        try:
+            socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError:
+            pass
+
+
+threading.Thread(target=prime_dns, name="prime_dns", daemon=True).start()
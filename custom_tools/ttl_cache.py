@@ -0,0 +1,49 @@
+import threading
+import time
+
+
+class TTLCache:
+    """
+    A small thread-safe in-process cache whose entries expire after a fixed number of seconds.
+
+    Used by the AWS tools to reuse results of read-only API calls that change slowly
+    (instance listings, bucket listings, bucket regions) across repeated agent queries.
+
+    Args:
+        ttl (float): Seconds an entry stays valid after it is stored.
+    """
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for a key, or `default` if it is missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if time.monotonic() - entry[0] >= self.ttl:
+                del self._entries[key]
+                return default
+            return entry[1]
+
+    def set(self, key, value) -> None:
+        """
+        Stores a value for a key, resetting its expiry.
+        """
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+
+    def invalidate(self, key=None) -> None:
+        """
+        Drops a single key, or every entry if no key is given.
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
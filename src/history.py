@@ -0,0 +1,67 @@
+from collections import deque
+
+
+class HistoryCompressor:
+    """
+    Keeps recent (query, response) turns of a chat session and renders them as a short,
+    truncated summary that can be prepended to the next query. This replaces sending the
+    raw prior responses to the model on every turn, so input size stays bounded.
+
+    Args:
+        max_turns (int): Number of past turns kept. Default is 20.
+        max_chars_per_message (int): Each query and response is cut to this many characters. Default is 120.
+        max_summary_chars (int): Upper bound on the length of the rendered summary. Default is 800.
+    """
+
+    def __init__(self, max_turns: int = 20, max_chars_per_message: int = 120, max_summary_chars: int = 800):
+        self.turns = deque(maxlen=max_turns)
+        self.max_chars_per_message = max_chars_per_message
+        self.max_summary_chars = max_summary_chars
+
+    def add(self, query: str, response: str) -> None:
+        """
+        Records a completed turn.
+
+        Args:
+            query (str): The user's query.
+            response (str): The agent's response.
+        """
+        self.turns.append((self._truncate(query), self._truncate(response or "")))
+
+    def summary(self) -> str:
+        """
+        Renders the most recent turns that fit in max_summary_chars, oldest first.
+
+        Returns:
+            str: The condensed history, or an empty string if there is none.
+        """
+        lines = []
+        used = 0
+        for query, response in reversed(self.turns):
+            line = f"- User: {query} | Assistant: {response}"
+            if used + len(line) > self.max_summary_chars:
+                break
+            lines.append(line)
+            used += len(line) + 1
+        return "\n".join(reversed(lines))
+
+    def prepend(self, query: str) -> str:
+        """
+        Prefixes a query with the condensed history of earlier turns.
+
+        Args:
+            query (str): The new user query.
+
+        Returns:
+            str: The query with the history summary in front, or the query unchanged if there is no history.
+        """
+        summary = self.summary()
+        if not summary:
+            return query
+        return f"Earlier in this conversation (condensed):\n{summary}\n\nCurrent query: {query}"
+
+    def _truncate(self, text: str) -> str:
+        text = " ".join(text.split())
+        if len(text) <= self.max_chars_per_message:
+            return text
+        return text[: self.max_chars_per_message - 3] + "..."
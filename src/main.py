@@ -1,37 +1,103 @@
+import asyncio
+import sys
+import threading
+
 from phi.agent import Agent
 from phi.model.openai import OpenAIChat
 from phi.model.anthropic import Claude
+from anthropic import Anthropic, DefaultHttpxClient
+import httpx
+from botocore.exceptions import BotoCoreError, ClientError
+from prompt_toolkit import PromptSession
 from custom_tools.aws_s3 import S3Tool
 from custom_tools.aws_ec2 import EC2Tool
+from custom_tools.aws_session import get_client, get_session
+from src.history import HistoryCompressor
 from dotenv import load_dotenv
 load_dotenv()
+# Create the shared boto3 session up front so the first query does not pay for it
+get_session()
 # Initialize the S3 tool
 s3_tool = S3Tool(region_name="us-east-1")
 ec2_tool = EC2Tool(region_name="us-east-1")
 
+# One Anthropic API client shared by every agent's model. Each agent still gets its own
+# Claude instance because phi stores the agent's tools and prompts on the model object.
+# The client speaks HTTP/2 (requires `httpx[http2]`), multiplexing requests over one kept-alive connection.
+CLAUDE_MODEL_ID = "claude-3-5-sonnet-20240620"
+anthropic_client = Anthropic(
+    http_client=DefaultHttpxClient(
+        http2=True,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    )
+)
+
+# Agent instructions, joined once into a single interned string per agent
+S3_INSTRUCTIONS = sys.intern("\n".join([
+    "You are an assistant that helps users interact with AWS S3.",
+    "Interpret user queries and execute the appropriate S3 operations using the provided tools.",
+    "Here is how you should respond to specific queries:",
+    "",
+    "1. If a user asks for a list of buckets, use the 'list_buckets' function.",
+    "2. If a user asks for objects in a specific bucket, use the 'list_objects' function with the bucket name as an argument.",
+    "3. If a user asks to upload a file to a bucket, use the 'upload_file' function with the file path, bucket name, and object name as arguments.",
+    "4. If a user asks to delete a specific file from a bucket, use the 'delete_file' function with the bucket name and object name as arguments.",
+    "5. If a user asks to create a new bucket, use the 'create_bucket' function with the bucket name and optional region name as arguments.",
+    "6. If a user asks to delete a bucket, use the 'delete_bucket' function with the bucket name as an argument.",
+    "",
+    "Provide clear and concise responses for all queries. If the operation is successful, confirm the success with a brief message.",
+    "If an operation fails or encounters an error, explain the issue and suggest possible fixes (e.g., checking permissions, ensuring the bucket is empty before deletion).",
+    "",
+    "If you don't understand the query or it's unrelated to AWS S3, politely inform the user and ask them to rephrase or clarify.",
+    "",
+    "Always include appropriate information in your responses to guide the user in achieving their goal effectively."
+]))
+
+EC2_INSTRUCTIONS = sys.intern("\n".join([
+    "You are an assistant that helps users interact with AWS EC2.",
+    "Interpret user queries and execute the appropriate EC2 operations using the provided tools.",
+    "",
+    "Here is how you should respond to specific queries:",
+    "1. If a user asks to list EC2 instances, use the 'list_instances' function.",
+    "2. If a user asks to start an instance, use the 'start_instance' function with the instance ID as an argument.",
+    "3. If a user asks to stop an instance, use the 'stop_instance' function with the instance ID as an argument.",
+    "4. If a user asks for the status of an instance, use the 'check_instance_status' function with the instance ID as an argument.",
+    "5. If a user asks to terminate an instance, use the 'terminate_instance' function with the instance ID as an argument.",
+    "6. If a user asks to create a new instance, use the 'create_instance' function with the following parameters:",
+    "   - 'image_id' for the AMI ID to launch the instance.",
+    "   - 'instance_type' for the desired EC2 instance type (e.g., 't2.micro').",
+    "   - Optional 'key_name' for the key pair to enable SSH access.",
+    "   - Optional 'security_group' for the security group to associate with the instance.",
+    "",
+    "Provide clear and concise responses for all queries. For example:",
+    "- 'List all EC2 instances' -> Respond with the instance IDs and their current states.",
+    "- 'Start instance i-0abcdef1234567890' -> Confirm that the instance is starting.",
+    "- 'Create an EC2 instance with AMI ami-0abcdef1234567890 and type t2.micro' -> Confirm the instance creation and provide the instance ID(s).",
+    "",
+    "If the operation is successful, confirm the success with a brief message.",
+    "If an operation fails or encounters an error, explain the issue and suggest possible fixes (e.g., checking permissions, ensuring the instance exists, or using a valid AMI ID).",
+    "",
+    "If you don't understand the query or it's unrelated to AWS EC2, politely inform the user and ask them to rephrase or clarify."
+]))
+
+AWS_INSTRUCTIONS = sys.intern("\n".join([
+    "You are an assistant that helps users manage AWS services.",
+    "Interpret user queries and delegate them to the appropriate service-specific agent (e.g., S3 or EC2).",
+    "",
+    "For each query:",
+    "1. Determine which AWS service the query pertains to.",
+    "2. Delegate the query to the corresponding agent responsible for that service.",
+    "3. Ensure the response is clear, concise, and confirms the success of the operation.",
+    "4. If an operation fails, provide an explanation and suggest possible fixes.",
+    "",
+    "If the query is unclear or pertains to an unsupported service, politely inform the user and ask for clarification."
+]))
+
 s3_agent = Agent(
     name="S3QueryAgent",
-    model=Claude(id="claude-3-5-sonnet-20240620"),
+    model=Claude(id=CLAUDE_MODEL_ID, client=anthropic_client),
     tools=[s3_tool],
-    instructions=[
-        "You are an assistant that helps users interact with AWS S3.",
-        "Interpret user queries and execute the appropriate S3 operations using the provided tools.",
-        "Here is how you should respond to specific queries:",
-        "",
-        "1. If a user asks for a list of buckets, use the 'list_buckets' function.",
-        "2. If a user asks for objects in a specific bucket, use the 'list_objects' function with the bucket name as an argument.",
-        "3. If a user asks to upload a file to a bucket, use the 'upload_file' function with the file path, bucket name, and object name as arguments.",
-        "4. If a user asks to delete a specific file from a bucket, use the 'delete_file' function with the bucket name and object name as arguments.",
-        "5. If a user asks to create a new bucket, use the 'create_bucket' function with the bucket name and optional region name as arguments.",
-        "6. If a user asks to delete a bucket, use the 'delete_bucket' function with the bucket name as an argument.",
-        "",
-        "Provide clear and concise responses for all queries. If the operation is successful, confirm the success with a brief message.",
-        "If an operation fails or encounters an error, explain the issue and suggest possible fixes (e.g., checking permissions, ensuring the bucket is empty before deletion).",
-        "",
-        "If you don't understand the query or it's unrelated to AWS S3, politely inform the user and ask them to rephrase or clarify.",
-        "",
-        "Always include appropriate information in your responses to guide the user in achieving their goal effectively."
-    ],
+    instructions=S3_INSTRUCTIONS,
     markdown=True,
     debug_mode=True,
     show_tool_calls=True,
@@ -40,34 +106,9 @@ s3_agent = Agent(
 
 ec2_agent = Agent(
     name="EC2QueryAgent",
-    model=Claude(id="claude-3-5-sonnet-20240620"),
+    model=Claude(id=CLAUDE_MODEL_ID, client=anthropic_client),
     tools=[ec2_tool],
-    instructions=[
-        "You are an assistant that helps users interact with AWS EC2.",
-        "Interpret user queries and execute the appropriate EC2 operations using the provided tools.",
-        "",
-        "Here is how you should respond to specific queries:",
-        "1. If a user asks to list EC2 instances, use the 'list_instances' function.",
-        "2. If a user asks to start an instance, use the 'start_instance' function with the instance ID as an argument.",
-        "3. If a user asks to stop an instance, use the 'stop_instance' function with the instance ID as an argument.",
-        "4. If a user asks for the status of an instance, use the 'check_instance_status' function with the instance ID as an argument.",
-        "5. If a user asks to terminate an instance, use the 'terminate_instance' function with the instance ID as an argument.",
-        "6. If a user asks to create a new instance, use the 'create_instance' function with the following parameters:",
-        "   - 'image_id' for the AMI ID to launch the instance.",
-        "   - 'instance_type' for the desired EC2 instance type (e.g., 't2.micro').",
-        "   - Optional 'key_name' for the key pair to enable SSH access.",
-        "   - Optional 'security_group' for the security group to associate with the instance.",
-        "",
-        "Provide clear and concise responses for all queries. For example:",
-        "- 'List all EC2 instances' -> Respond with the instance IDs and their current states.",
-        "- 'Start instance i-0abcdef1234567890' -> Confirm that the instance is starting.",
-        "- 'Create an EC2 instance with AMI ami-0abcdef1234567890 and type t2.micro' -> Confirm the instance creation and provide the instance ID(s).",
-        "",
-        "If the operation is successful, confirm the success with a brief message.",
-        "If an operation fails or encounters an error, explain the issue and suggest possible fixes (e.g., checking permissions, ensuring the instance exists, or using a valid AMI ID).",
-        "",
-        "If you don't understand the query or it's unrelated to AWS EC2, politely inform the user and ask them to rephrase or clarify.",
-    ],
+    instructions=EC2_INSTRUCTIONS,
     markdown=True,
     debug_mode=True,
     show_tool_calls=True,
@@ -76,40 +117,51 @@ ec2_agent = Agent(
 
 aws_agent = Agent(
     name="AWSManagementAgent",
-    model=Claude(id="claude-3-5-sonnet-20240620"),
+    model=Claude(id=CLAUDE_MODEL_ID, client=anthropic_client),
     team=[s3_agent, ec2_agent],
-    instructions=[
-        "You are an assistant that helps users manage AWS services.",
-        "Interpret user queries and delegate them to the appropriate service-specific agent (e.g., S3 or EC2).",
-        "",
-        "For each query:",
-        "1. Determine which AWS service the query pertains to.",
-        "2. Delegate the query to the corresponding agent responsible for that service.",
-        "3. Ensure the response is clear, concise, and confirms the success of the operation.",
-        "4. If an operation fails, provide an explanation and suggest possible fixes.",
-        "",
-        "If the query is unclear or pertains to an unsupported service, politely inform the user and ask for clarification.",
-    ],
-    add_history_to_messages=True,
-    num_history_responses=5,
+    instructions=AWS_INSTRUCTIONS,
     markdown=True,
     debug_mode=True,
     show_tool_calls=True,
     add_datetime_to_instructions=True,
 )
 
-# Function to process user queries
-def process_query(user_query: str):
-    response = aws_agent.run(user_query)
+# Condensed history of earlier turns, sent with each query instead of the raw prior responses
+history = HistoryCompressor()
+
+# Function to process user queries. The agent runs in a worker thread so the event loop
+# stays free for the prompt.
+async def process_query(user_query: str):
+    response = await asyncio.to_thread(aws_agent.run, history.prepend(user_query))
+    history.add(user_query, response.content)
     return response.content
 
-# Example usage
-if __name__ == "__main__":
+def _check_caller_identity():
+    try:
+        get_client("sts", "us-east-1").get_caller_identity()
+    except (BotoCoreError, ClientError):
+        pass
+
+# Resolve credentials and open an AWS connection while the user is typing. The daemon thread
+# is never joined, so quitting does not wait on it.
+def prewarm():
+    threading.Thread(target=_check_caller_identity, name="prewarm", daemon=True).start()
+
+async def main():
+    session = PromptSession()
+    prewarm()
     while True:
-        user_query = user_query = input("\nEnter your query: ").strip()
+        try:
+            user_query = (await session.prompt_async("\nEnter your query: ")).strip()
+        except EOFError:
+            user_query = "quit"
         if user_query.lower() == "quit":
             print("Exiting the aws helper agenet. Goodbye!")
             break
-        result = process_query(user_query)
+        result = await process_query(user_query)
         print(result)
 
+# Example usage
+if __name__ == "__main__":
+    asyncio.run(main())
+